@@ -15,7 +15,12 @@ from typing import Any, Dict, List, Optional, Tuple
 from flask import Blueprint, Response, abort, jsonify, request, send_file, g
 
 from services.extensions_registry import ALLOWED_PLATFORMS, REGISTRY
-from services.releases import RELEASES_ROOT, UNIVERSAL_PLATFORM, get_latest_version_from_symlinks
+from services.releases import (
+    RELEASES_ROOT,
+    UNIVERSAL_PLATFORM,
+    get_latest_version_from_symlinks,
+    invalidate_projects_cache,
+)
 
 
 bp_marketplace = Blueprint("marketplace_api", __name__)
@@ -545,6 +550,7 @@ def publish_extension_openvsx() -> Tuple[Response, int]:
     except Exception:
         return jsonify({"state": False, "status": "error", "error": "Write failed"}), 500
 
+    invalidate_projects_cache()
     try:
         REGISTRY.init_and_rebuild()
     except Exception:
@@ -7,7 +7,7 @@ import time
 from flask import Blueprint, Response, abort, jsonify, request, url_for
 
 from services.ide_registry import IDE_REGISTRY
-from services.releases import RELEASES_ROOT, is_safe_relpath, normalize_platform
+from services.releases import RELEASES_ROOT, invalidate_projects_cache, is_safe_relpath, normalize_platform
 
 bp_ide = Blueprint("ide_api", __name__)
 
@@ -482,6 +482,7 @@ def ide_upload():
             pass
 
     # Rebuild IDE index after successful write
+    invalidate_projects_cache()
     try:
         IDE_REGISTRY.init_and_rebuild()
     except Exception:
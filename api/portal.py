@@ -17,8 +17,9 @@ from api.releases_api import _iter_endpoints
 from services.releases import (
     RELEASES_ROOT,
     build_projects_only,
-    clear_dir_files_only,
+    clear_latest_tree,
     get_latest_version_from_symlinks,
+    invalidate_projects_cache,
     list_versions,
     normalize_platform,
     set_latest_atomic,
@@ -47,6 +48,7 @@ def _maybe_rebuild_indexes(category: str) -> None:
     Per TZ: after IDE mutations must call IDE_REGISTRY.init_and_rebuild().
     """
     cat = (category or "").strip().lower()
+    invalidate_projects_cache()
     try:
         if cat == "ide":
             IDE_REGISTRY.init_and_rebuild()
@@ -200,7 +202,7 @@ def admin_delete_release():
             except Exception:
                 pass
         else:
-            clear_dir_files_only(pd / "latest")
+            clear_latest_tree(pd)
 
     _maybe_rebuild_indexes(category)
 
@@ -143,7 +143,7 @@ class ExtensionsRegistry:
                         INSERT INTO extensions(namespace, name, version, target_platform, dir_path, published_ts)
                         VALUES(?, ?, ?, ?, ?, ?)
                         """,
-                        [(r.namespace, r.name, r.version, r.target_platform, str(r.dir_path), r.published_ts) for r in rows],
+                        ((r.namespace, r.name, r.version, r.target_platform, str(r.dir_path), r.published_ts) for r in rows),
                     )
                     conn.execute("COMMIT")
                 except Exception:
@@ -2,16 +2,49 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from services.releases import RELEASES_ROOT, get_latest_version_from_symlinks, normalize_platform
 
 
+# Hot-path queries; kept as constants so the text is identical on every call
+# and always hits the connection's prepared-statement cache.
+_SQL_LIST_VERSIONS = """
+    SELECT
+        version AS version,
+        MAX(published_ts) AS published_ts,
+        MAX((flags >> 1) & 1) AS is_latest
+    FROM ide_platforms
+    WHERE project=? AND flags & 1 = 1
+    GROUP BY version
+    ORDER BY version DESC
+"""
+
+# Primary-key lookup on the materialized ide_latest table
+_SQL_PICK_LATEST = """
+    SELECT binary_rel_path, binary_filename
+    FROM ide_latest
+    WHERE project=? AND platform=?
+"""
+
+# Bump when the on-disk layout changes; the index is rebuilt from the filesystem anyway,
+# so a mismatching PRAGMA user_version simply drops the old tables.
+_SCHEMA_VERSION = 4
+
+# ide_platforms.flags bits; "valid latest" is flags & 3 = 3
+_FLAG_VALID = 1
+_FLAG_LATEST = 2
+
+# Read results are served from memory for this long; rebuilds invalidate immediately
+_READ_CACHE_TTL_S = 5.0
+
+
 def _indexes_root() -> Path:
     return Path(RELEASES_ROOT) / "_indexes"
 
@@ -24,13 +57,14 @@ def _ide_root() -> Path:
     return Path(RELEASES_ROOT) / "ide"
 
 
+_BAD_SEG_CHARS = frozenset("\x00/\\")
+
+
 def _safe_seg(s: str) -> bool:
     # keep it simple; these are filesystem folder names under our control
     if not s or s in {".", ".."}:
         return False
-    if any(ch in s for ch in ("\x00", "/", "\\")):
-        return False
-    return True
+    return _BAD_SEG_CHARS.isdisjoint(s)
 
 
 def _read_json_utf8(p: Path) -> Optional[dict]:
@@ -74,13 +108,19 @@ class IdeRegistry:
     # SQLite-backed registry for IDE releases (platform-level, per TZ)
     def __init__(self) -> None:
         self._local = threading.local()
-        self._init_lock = threading.Lock()
+        # single writer connection; all use of it is serialized by _write_lock
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
         self._inited = False
+        # (kind, *args) -> (monotonic ts, result); _cache_gen bumps on every rebuild
+        self._cache: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_gen = 0
 
-    def _conn(self) -> sqlite3.Connection:
-        c = getattr(self._local, "conn", None)
-        if c is not None:
-            return c
+    def _writer_conn(self) -> sqlite3.Connection:
+        # caller must hold self._write_lock
+        if self._writer is not None:
+            return self._writer
 
         p = _db_path()
         p.parent.mkdir(parents=True, exist_ok=True)
@@ -90,25 +130,71 @@ class IdeRegistry:
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA foreign_keys=ON")
-        self._local.conn = conn
+        self._writer = conn
         return conn
 
+    def _reader_conn(self) -> sqlite3.Connection:
+        # Thread-local read-only connection; under WAL readers never wait for the rebuild writer
+        c = getattr(self._local, "reader", None)
+        if c is not None:
+            return c
+
+        uri = _db_path().resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+        self._local.reader = conn
+        return conn
+
+    def _cached(self, key: Tuple[str, ...], load: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < _READ_CACHE_TTL_S:
+                return hit[1]
+            gen = self._cache_gen
+
+        value = load()
+
+        with self._cache_lock:
+            # drop results read while a rebuild was in flight
+            if gen == self._cache_gen:
+                self._cache[key] = (now, value)
+        return value
+
+    def _invalidate_cache(self) -> None:
+        with self._cache_lock:
+            self._cache_gen += 1
+            self._cache.clear()
+
     def init_and_rebuild(self) -> None:
         """
         Initialize schema and rebuild from filesystem.
 
         Requirements implemented:
         - index stored at RELEASES_ROOT/_indexes/ide_index.sqlite
-        - table ide_platforms with PK(project, version, platform)
+        - table ide_platforms with PK(project, version, platform), WITHOUT ROWID
+        - table ide_latest with PK(project, platform): valid stable-latest binaries, used by pick_latest_asset
         - scan ide/<project>/<version>/<platform>/
         - validation: exactly one *.json, matching binary exists, json required fields,
           normalize_platform(os_type, arch) == platform dir, sub_product_name == project, version == version dir
         - UNIVERSAL_PLATFORM is not used for IDE
         """
-        with self._init_lock:
-            conn = self._conn()
+        with self._write_lock:
+            conn = self._writer_conn()
             conn.execute("BEGIN IMMEDIATE")
             try:
+                if int(conn.execute("PRAGMA user_version").fetchone()[0]) != _SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS ide_platforms")
+                    conn.execute("DROP TABLE IF EXISTS ide_latest")
+                    conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS ide_platforms (
@@ -118,11 +204,22 @@ class IdeRegistry:
                         meta_rel_path TEXT NOT NULL,
                         binary_rel_path TEXT NOT NULL,
                         published_ts INTEGER NOT NULL,
-                        is_latest INTEGER NOT NULL,
-                        is_valid INTEGER NOT NULL,
+                        flags INTEGER NOT NULL DEFAULT 0,
                         invalid_reason TEXT NULL,
                         PRIMARY KEY (project, version, platform)
-                    )
+                    ) WITHOUT ROWID
+                    """
+                )
+                # Materialized stable-latest asset per (project, platform), refreshed on every rebuild
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS ide_latest (
+                        project TEXT NOT NULL,
+                        platform TEXT NOT NULL,
+                        binary_rel_path TEXT NOT NULL,
+                        binary_filename TEXT NOT NULL,
+                        PRIMARY KEY (project, platform)
+                    ) WITHOUT ROWID
                     """
                 )
                 conn.execute("DELETE FROM ide_platforms")
@@ -131,53 +228,66 @@ class IdeRegistry:
                 conn.execute("ROLLBACK")
                 raise
 
-            rows = self._scan_fs_rows()
-            if rows:
-                conn.execute("BEGIN IMMEDIATE")
-                try:
-                    conn.executemany(
-                        """
-                        INSERT INTO ide_platforms(
-                            project, version, platform,
-                            meta_rel_path, binary_rel_path,
-                            published_ts, is_latest, is_valid, invalid_reason
-                        )
-                        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        [
-                            (
-                                r.project,
-                                r.version,
-                                r.platform,
-                                r.meta_rel_path,
-                                r.binary_rel_path,
-                                int(r.published_ts),
-                                int(r.is_latest),
-                                int(r.is_valid),
-                                r.invalid_reason,
-                            )
-                            for r in rows
-                        ],
+            # Walk the filesystem before BEGIN IMMEDIATE: the write lock then covers only the inserts,
+            # not the scan, so concurrent rebuilds from other workers don't queue behind a full tree walk
+            rows = [
+                (
+                    r.project,
+                    r.version,
+                    r.platform,
+                    r.meta_rel_path,
+                    r.binary_rel_path,
+                    int(r.published_ts),
+                    (_FLAG_VALID if r.is_valid else 0) | (_FLAG_LATEST if r.is_latest else 0),
+                    r.invalid_reason,
+                )
+                for r in self._scan_fs_rows()
+            ]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """
+                    INSERT INTO ide_platforms(
+                        project, version, platform,
+                        meta_rel_path, binary_rel_path,
+                        published_ts, flags, invalid_reason
                     )
-                    conn.execute("COMMIT")
-                except Exception:
-                    conn.execute("ROLLBACK")
-                    raise
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                latest_rows = conn.execute(
+                    "SELECT project, platform, binary_rel_path FROM ide_platforms WHERE flags & 3 = 3"
+                ).fetchall()
+                conn.execute("DELETE FROM ide_latest")
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO ide_latest(project, platform, binary_rel_path, binary_filename)
+                    VALUES(?, ?, ?, ?)
+                    """,
+                    (
+                        (r["project"], r["platform"], r["binary_rel_path"], r["binary_rel_path"].rsplit("/", 1)[-1])
+                        for r in latest_rows
+                    ),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
 
             # Indexes per TZ
             conn.execute("CREATE INDEX IF NOT EXISTS idx_ide_project_ver ON ide_platforms(project, version)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_ide_project_latest_platform ON ide_platforms(project, is_latest, platform)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_ide_project_published ON ide_platforms(project, published_ts DESC)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_ide_project_platform ON ide_platforms(project, platform)")
 
             self._inited = True
+            self._invalidate_cache()
 
-    def _scan_fs_rows(self) -> List[IdePlatformRow]:
+    def _scan_fs_rows(self) -> Iterator[IdePlatformRow]:
         root = _ide_root()
         if not root.is_dir():
-            return []
+            return
 
-        out: List[IdePlatformRow] = []
         now = int(time.time())
 
         for proj_dir in root.iterdir():
@@ -193,8 +303,10 @@ class IdeRegistry:
                 if not ver_dir.is_dir():
                     continue
                 ver = ver_dir.name.strip()
-                if not _safe_seg(ver) or ver.lower() == "latest":
+                # Dot-prefixed dirs are latest-tree scratch space (.latest_tmp_*), never versions
+                if not _safe_seg(ver) or ver.lower() == "latest" or ver.startswith("."):
                     continue
+                is_latest = 1 if stable_latest and ver == stable_latest else 0
 
                 # Only platform subdirs are considered. Files directly in version dir are ignored for IDE.
                 for plat_dir in ver_dir.iterdir():
@@ -204,46 +316,57 @@ class IdeRegistry:
                     if not _safe_seg(platform) or platform.lower() == "latest":
                         continue
 
-                    meta_files = [p for p in plat_dir.iterdir() if p.is_file() and p.name.endswith(".json")]
+                    # One pass over the platform dir: meta candidates plus every sibling file,
+                    # so the binary check below is a dict lookup rather than another syscall
+                    meta_entries: List[os.DirEntry] = []
+                    file_entries: Dict[str, os.DirEntry] = {}
+                    with os.scandir(plat_dir) as it:
+                        for e in it:
+                            if not e.is_file():
+                                continue
+                            file_entries[e.name] = e
+                            if e.name.endswith(".json"):
+                                meta_entries.append(e)
                     meta_rel_path = ""
                     binary_rel_path = ""
                     published_ts = now
-                    is_latest = 1 if stable_latest and ver == stable_latest else 0
                     is_valid = 0
                     invalid_reason: Optional[str] = None
 
-                    if len(meta_files) == 0:
+                    if len(meta_entries) == 0:
                         invalid_reason = "no_meta_json"
-                    elif len(meta_files) > 1:
+                    elif len(meta_entries) > 1:
                         invalid_reason = "multiple_meta_json"
                     else:
-                        meta_p = meta_files[0]
-                        meta_name = meta_p.name
+                        meta_e = meta_entries[0]
+                        meta_name = meta_e.name
 
-                        # Derive binary: meta filename without ".json" suffix
-                        binary_p = meta_p.with_suffix("")  # removes only .json
+                        # Derive binary: meta filename without ".json" suffix (checked above)
+                        binary_name = meta_name[:-5]
 
                         # Build rel paths regardless of validity (must be NOT NULL in DB)
                         meta_rel_path = f"ide/{project}/{ver}/{platform}/{meta_name}"
-                        binary_rel_path = f"ide/{project}/{ver}/{platform}/{binary_p.name}"
+                        binary_rel_path = f"ide/{project}/{ver}/{platform}/{binary_name}"
 
-                        # published_ts = max(mtime(meta), mtime(binary)) when possible
+                        # published_ts = max(mtime(meta), mtime(binary)) when possible;
+                        # both stats come from the DirEntry objects already in hand
                         try:
-                            mt = int(meta_p.stat().st_mtime)
+                            mt = int(meta_e.stat().st_mtime)
                         except Exception:
                             mt = now
+                        binary_e = file_entries.get(binary_name)
                         bt = mt
-                        if binary_p.is_file():
+                        if binary_e is not None:
                             try:
-                                bt = int(binary_p.stat().st_mtime)
+                                bt = int(binary_e.stat().st_mtime)
                             except Exception:
                                 bt = mt
                         published_ts = max(mt, bt)
 
-                        if not binary_p.is_file():
+                        if binary_e is None:
                             invalid_reason = "binary_missing"
                         else:
-                            obj = _read_json_utf8(meta_p)
+                            obj = _read_json_utf8(Path(meta_e.path))
                             if obj is None:
                                 invalid_reason = "meta_json_unparseable"
                             else:
@@ -278,22 +401,18 @@ class IdeRegistry:
                     if not binary_rel_path:
                         binary_rel_path = f"ide/{project}/{ver}/{platform}/"
 
-                    out.append(
-                        IdePlatformRow(
-                            project=project,
-                            version=ver,
-                            platform=platform,
-                            meta_rel_path=meta_rel_path,
-                            binary_rel_path=binary_rel_path,
-                            published_ts=int(published_ts),
-                            is_latest=int(is_latest),
-                            is_valid=int(is_valid),
-                            invalid_reason=invalid_reason,
-                        )
+                    yield IdePlatformRow(
+                        project=project,
+                        version=ver,
+                        platform=platform,
+                        meta_rel_path=meta_rel_path,
+                        binary_rel_path=binary_rel_path,
+                        published_ts=int(published_ts),
+                        is_latest=is_latest,
+                        is_valid=int(is_valid),
+                        invalid_reason=invalid_reason,
                     )
 
-        return out
-
     def _ensure_inited(self) -> None:
         if not self._inited:
             self.init_and_rebuild()
@@ -320,18 +439,12 @@ class IdeRegistry:
         if not _safe_seg(proj):
             return []
 
-        conn = self._conn()
+        return list(self._cached(("lv", proj), lambda: self._load_versions(proj)))
+
+    def _load_versions(self, proj: str) -> List[IdeVersionRow]:
+        conn = self._reader_conn()
         rows = conn.execute(
-            """
-            SELECT
-                version AS version,
-                MAX(published_ts) AS published_ts,
-                MAX(is_latest) AS is_latest
-            FROM ide_platforms
-            WHERE project=? AND is_valid=1
-            GROUP BY version
-            ORDER BY version DESC
-            """,
+            _SQL_LIST_VERSIONS,
             (proj,),
         ).fetchall()
 
@@ -352,8 +465,8 @@ class IdeRegistry:
 
         Per TZ:
         - NO universal fallback
-        - platform must match normalize_platform(os_type, arch) == platform dir name (enforced in is_valid=1)
-        - choose only is_latest=1 AND is_valid=1
+        - platform must match normalize_platform(os_type, arch) == platform dir name (enforced by the valid flag)
+        - choose only rows flagged latest and valid (materialized into ide_latest on rebuild)
         """
         self._ensure_inited()
         proj = (project or "").strip()
@@ -361,22 +474,17 @@ class IdeRegistry:
         if not _safe_seg(proj) or not _safe_seg(plat):
             return None
 
-        conn = self._conn()
+        return self._cached(("pla", proj, plat), lambda: self._load_latest_asset(proj, plat))
+
+    def _load_latest_asset(self, proj: str, plat: str) -> Optional[Tuple[str, str]]:
+        conn = self._reader_conn()
         row = conn.execute(
-            """
-            SELECT binary_rel_path
-            FROM ide_platforms
-            WHERE project=? AND platform=? AND is_latest=1 AND is_valid=1
-            LIMIT 1
-            """,
+            _SQL_PICK_LATEST,
             (proj, plat),
         ).fetchone()
         if not row:
             return None
-
-        rel = str(row["binary_rel_path"])
-        name = Path(rel).name
-        return (rel, name)
+        return (str(row["binary_rel_path"]), str(row["binary_filename"]))
 
 
 IDE_REGISTRY = IdeRegistry()
@@ -1,12 +1,19 @@
 # services/releases.py
 from __future__ import annotations
 
+import json
 import os
 import re
 import shutil
+import stat
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 try:
     from packaging.version import InvalidVersion, Version  # type: ignore
@@ -19,12 +26,13 @@ except Exception:  # pragma: no cover
 # Release notes (merged from notes.py)
 # =========================
 
-def read_release_notes(version_dir: Path) -> Optional[Tuple[str, str, str, str]]:
+def read_release_notes(version_dir: Union[str, Path]) -> Optional[Tuple[str, str, str, str]]:
     """
     Returns (filename, notes_text, notes_html, notes_format) where notes_format is 'html' or 'text'.
     Notes HTML is returned as-is if the file is .html; otherwise it's the raw text (no markdown rendering).
     """
-    if not version_dir.is_dir():
+    vd = os.fspath(version_dir)
+    if not os.path.isdir(vd):
         return None
 
     candidates = [
@@ -39,17 +47,18 @@ def read_release_notes(version_dir: Path) -> Optional[Tuple[str, str, str, str]]
     ]
 
     for name in candidates:
-        p = version_dir / name
-        if not p.is_file():
+        p = os.path.join(vd, name)
+        if not os.path.isfile(p):
             continue
 
         try:
-            raw = p.read_text(encoding="utf-8")
+            with open(p, encoding="utf-8") as f:
+                raw = f.read()
         except Exception:
             continue
 
-        fmt = "html" if p.suffix.lower() == ".html" else "text"
-        return (p.name, raw, raw, fmt)
+        fmt = "html" if name.lower().endswith(".html") else "text"
+        return (name, raw, raw, fmt)
 
     return None
 
@@ -88,7 +97,7 @@ CANONICAL_PLATFORMS: Dict[Tuple[str, str], str] = {
 }
 
 # Asset names excluded from lists
-EXCLUDED_ASSET_NAMES_LOWER = {"readme.md", "release.md"}
+EXCLUDED_ASSET_NAMES_LOWER = frozenset({"readme.md", "release.md"})
 
 
 # =========================
@@ -111,34 +120,46 @@ def indexes_root() -> Path:
     return INDEXES_ROOT
 
 
+_OS_ALIASES: Dict[str, str] = {
+    "win": "windows",
+    "windows": "windows",
+    "win32": "windows",
+    "mac": "darwin",
+    "macos": "darwin",
+    "osx": "darwin",
+    "darwin": "darwin",
+    "linux": "linux",
+    "alpine": "alpine",
+}
+
+_ARCH_ALIASES: Dict[str, str] = {
+    "x64": "x86-64",
+    "x86_64": "x86-64",
+    "x86-64": "x86-64",
+    "amd64": "x86-64",
+    "arm64": "arm64",
+    "aarch64": "arm64",
+    "armhf": "armhf",
+    "armv7": "armhf",
+    "armv7l": "armhf",
+}
+
+
 def normalize_os(os_raw: str) -> str:
     # Normalize OS strings
     x = os_raw.strip().lower()
-    if x in ("win", "windows", "win32"):
-        return "windows"
-    if x in ("mac", "macos", "osx", "darwin"):
-        return "darwin"
-    if x == "linux":
-        return "linux"
-    if x == "alpine":
-        return "alpine"
-    return x
+    return _OS_ALIASES.get(x, x)
 
 
 def normalize_arch(arch_raw: str) -> str:
     # Normalize arch strings
     x = arch_raw.strip().lower()
-    if x in ("x64", "x86_64", "x86-64", "amd64"):
-        return "x86-64"
-    if x in ("arm64", "aarch64"):
-        return "arm64"
-    if x in ("armhf", "armv7", "armv7l"):
-        return "armhf"
-    return x
+    return _ARCH_ALIASES.get(x, x)
 
 
+@lru_cache(maxsize=256)
 def normalize_platform(os_raw: str, arch_raw: str) -> str:
-    # Convert OS+arch to canonical platform string
+    # Convert OS+arch to canonical platform string (cached: the real input space is tiny)
     os_key = normalize_os(os_raw)
     arch_key = normalize_arch(arch_raw)
     return CANONICAL_PLATFORMS.get((os_key, arch_key), f"{os_key}-{arch_key}")
@@ -149,6 +170,7 @@ _semverish_re = re.compile(
 )
 
 
+@lru_cache(maxsize=8192)
 def _semverish_key(v: str) -> Tuple:
     # Fallback semver-ish sort key
     s = v.strip()
@@ -162,8 +184,9 @@ def _semverish_key(v: str) -> Tuple:
     return (1, tuple(nums), is_final, pre_key)
 
 
+@lru_cache(maxsize=8192)
 def parse_version_key(version: str) -> Tuple:
-    # Prefer packaging.version when available
+    # Prefer packaging.version when available; cached since the same version strings are sorted on every request
     if Version is not None:
         try:
             return (2, Version(version.strip().lstrip("v")))
@@ -173,77 +196,154 @@ def parse_version_key(version: str) -> Tuple:
 
 
 def is_safe_relpath(p: str) -> bool:
-    # Validate relative path
-    if not p or "\x00" in p:
-        return False
-    pp = Path(p)
-    if pp.is_absolute() or pp.drive:
+    # Validate relative path with plain string checks; "\\" counts as a separator on every OS
+    if not p or "\x00" in p or p[0] in "/\\":
         return False
-    if any(part == ".." for part in pp.parts):
+    if len(p) >= 2 and p[1] == ":":
         return False
-    return not p.startswith(("/", "\\"))
+    return ".." not in p.replace("\\", "/").split("/")
+
+
+# (unit, divisor) per 10-bit magnitude class
+_SIZE_UNITS: Tuple[Tuple[str, int], ...] = (("B", 1), ("KB", 1 << 10), ("MB", 1 << 20), ("GB", 1 << 30))
 
 
+@lru_cache(maxsize=1024)
 def human_size(num_bytes: int) -> str:
-    # Render human-readable file size
-    if num_bytes < 1024:
+    # Render human-readable file size; bit_length picks the unit without a comparison ladder
+    idx = min(max(num_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    if idx == 0:
         return f"{num_bytes} B"
-    if num_bytes < 1024 * 1024:
-        return f"{num_bytes / 1024:.1f} KB"
-    if num_bytes < 1024 * 1024 * 1024:
-        return f"{num_bytes / (1024 * 1024):.1f} MB"
-    return f"{num_bytes / (1024 * 1024 * 1024):.1f} GB"
+    unit, div = _SIZE_UNITS[idx]
+    return f"{num_bytes / div:.1f} {unit}"
+
+
+class _DirCache:
+    # Memoized directory listings: path -> (subdir entries, file entries); safe to share across worker threads
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[List[os.DirEntry], List[os.DirEntry]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Union[str, Path]) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+        key = os.fspath(path)
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is None:
+            hit = _scan_dir_uncached(key)
+            with self._lock:
+                hit = self._entries.setdefault(key, hit)
+        return hit
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        # Drop a directory and everything cached below it
+        key = os.fspath(path)
+        prefix = key.rstrip(os.sep) + os.sep
+        with self._lock:
+            for k in [k for k in self._entries if k == key or k.startswith(prefix)]:
+                del self._entries[k]
+
+
+_dircache_local = threading.local()
+
+
+@contextmanager
+def dircache(cache: Optional[_DirCache] = None) -> Iterator[_DirCache]:
+    # Share directory listings for the duration of one portal build; nested use reuses the outer cache.
+    # Pass an existing cache to install it in a worker thread.
+    active = getattr(_dircache_local, "cache", None)
+    if active is not None:
+        yield active
+        return
+    c = cache if cache is not None else _DirCache()
+    _dircache_local.cache = c
+    try:
+        yield c
+    finally:
+        _dircache_local.cache = None
 
 
-def list_dirs(p: Path) -> List[Path]:
-    # List directories safely
+def _invalidate_dircache(path: Path) -> None:
+    active = getattr(_dircache_local, "cache", None)
+    if active is not None:
+        active.invalidate(path)
+
+
+def _scan_dir_uncached(p: str) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    dirs: List[os.DirEntry] = []
+    files: List[os.DirEntry] = []
     try:
-        return [x for x in p.iterdir() if x.is_dir()]
+        with os.scandir(p) as it:
+            for e in it:
+                if e.is_dir():
+                    dirs.append(e)
+                elif e.is_file():
+                    files.append(e)
     except OSError:
-        return []
+        pass
+    return dirs, files
 
 
-def _is_excluded_asset_name(name: str) -> bool:
-    # Check excluded asset names
-    return name.strip().lower() in EXCLUDED_ASSET_NAMES_LOWER
+def _scan_dir(p: Union[str, Path]) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    # One scandir pass classified into (dirs, files); served from the active dircache() if any
+    active = getattr(_dircache_local, "cache", None)
+    if active is not None:
+        return active.get(p)
+    return _scan_dir_uncached(os.fspath(p))
 
 
-def list_files_assets(p: Path) -> List[Path]:
-    # List asset files excluding known non-assets
-    try:
-        out: List[Path] = []
-        for x in p.iterdir():
-            if x.is_file() and not _is_excluded_asset_name(x.name):
-                out.append(x)
-        return out
-    except OSError:
-        return []
+def list_dirs(p: Path) -> List[Path]:
+    # List directories safely
+    return [Path(e.path) for e in _scan_dir(p)[0]]
+
+
+def list_dirs_scandir(p: Union[str, Path]) -> List[os.DirEntry]:
+    # List directories as DirEntry objects (type comes from the dirent, no extra stat)
+    return list(_scan_dir(p)[0])
+
+
+def list_files_assets(p: Union[str, Path]) -> List[os.DirEntry]:
+    # List asset files excluding known non-assets; DirEntry caches stat() for size lookups
+    return [x for x in _scan_dir(p)[1] if x.name.lower() not in EXCLUDED_ASSET_NAMES_LOWER]
+
+
+def scan_version(vdir: Union[str, Path]) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+    # One scandir pass over a version dir: (asset files, platform subdirs)
+    dirs, files = _scan_dir(vdir)
+    return [x for x in files if x.name.lower() not in EXCLUDED_ASSET_NAMES_LOWER], list(dirs)
 
 
 def unlink_if_exists(p: Path) -> None:
-    # Remove file or symlink if present
+    # Remove file or symlink if present; EAFP, a single unlink syscall
     try:
-        if p.is_symlink() or p.is_file():
-            p.unlink()
+        os.unlink(os.fspath(p))
     except OSError:
+        # Missing, a directory, or not permitted: nothing to remove
         pass
 
 
 def clear_dir_files_only(p: Path) -> None:
-    # Remove only files inside directory recursively, keep directories
-    if not p.is_dir():
-        return
-    for child in p.iterdir():
-        if child.is_dir():
-            clear_dir_files_only(child)
-        else:
-            unlink_if_exists(child)
+    # Remove only files inside directory recursively, keep directories; iterative scandir walk
+    stack = [os.fspath(p)]
+    while stack:
+        cur = stack.pop()
+        try:
+            with os.scandir(cur) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    else:
+                        try:
+                            os.unlink(e.path)
+                        except OSError:
+                            pass
+        except OSError:
+            continue
 
 
-def _published_epoch_from_dir(vdir: Path) -> Optional[str]:
+def _published_epoch_from_dir(vdir: Union[str, Path]) -> Optional[str]:
     # Use directory mtime as "published at"
     try:
-        return str(int(vdir.stat().st_mtime))
+        return str(int(os.stat(vdir).st_mtime))
     except OSError:
         return None
 
@@ -253,58 +353,199 @@ def list_categories() -> List[str]:
     return [c for c in CATEGORIES if (RELEASES_ROOT / c).is_dir()]
 
 
+# category dir -> (st_mtime_ns, sorted project names); adding/removing a project bumps the dir mtime.
+# Writers in this app also call invalidate_projects_cache(), since the mtime alone can miss a change.
+_proj_cache: Dict[str, Tuple[int, List[str]]] = {}
+
+# A dir mtime this recent may still change within the same timestamp tick on coarse-mtime filesystems
+_PROJ_CACHE_MTIME_SLACK_NS = 2_000_000_000
+
+
+def invalidate_projects_cache() -> None:
+    # Drop cached project lists; call after creating or deleting products
+    _proj_cache.clear()
+
+
 def list_projects_for_category(category: str) -> List[str]:
     # List projects under a category (non-extensions)
-    cat_dir = RELEASES_ROOT / category
-    if not cat_dir.is_dir():
+    cat_dir = os.path.join(RELEASES_ROOT, category)
+    try:
+        st = os.stat(cat_dir)
+    except OSError:
+        return []
+    if not stat.S_ISDIR(st.st_mode):
         return []
-    return sorted([p.name for p in list_dirs(cat_dir) if p.name.lower() != "latest"])
+    hit = _proj_cache.get(cat_dir)
+    if hit is not None and hit[0] == st.st_mtime_ns:
+        return list(hit[1])
+    result = sorted([e.name for e in list_dirs_scandir(cat_dir) if e.name.lower() != "latest"])
+    if time.time_ns() - st.st_mtime_ns > _PROJ_CACHE_MTIME_SLACK_NS:
+        _proj_cache[cat_dir] = (st.st_mtime_ns, result)
+    return list(result)
 
 
 def list_versions(product_dir: Path, category: str) -> List[str]:
     # List versions for a product
     versions = [
-        p.name
-        for p in list_dirs(product_dir)
-        if p.name.lower() not in {"latest", "latest-prerelease"}
+        e.name
+        for e in list_dirs_scandir(product_dir)
+        if e.name.lower() not in {"latest", "latest-prerelease"} and not e.name.startswith(".")
     ]
     if category == "tools":
+        pd = os.fspath(product_dir)
         return sorted(
             versions,
-            key=lambda v: int(_published_epoch_from_dir(product_dir / v) or "0"),
+            key=lambda v: int(_published_epoch_from_dir(os.path.join(pd, v)) or "0"),
             reverse=True,
         )
     return sorted(versions, key=parse_version_key, reverse=True)
 
 
-def extract_version_from_symlink_target(product_dir: Path, link: Path) -> Optional[str]:
-    # Extract a version from symlink target path parts
+_NAV_PARTS = frozenset({"", ".", "..", "latest", "latest-prerelease"})
+
+
+def _product_dir_names(product_dir: Path) -> frozenset:
+    # Names of the directories directly under a product dir
+    dirs, _ = _scan_dir(product_dir)
+    return frozenset(e.name for e in dirs)
+
+
+def extract_version_from_symlink_target(
+    product_dir: Path,
+    link: Union[str, Path],
+    valid_versions: Optional[frozenset] = None,
+) -> Optional[str]:
+    # Extract a version from symlink target path parts; pass valid_versions to skip the directory scan
     try:
-        raw_target = os.readlink(str(link))
+        raw_target = os.readlink(link)
     except OSError:
         return None
-    for part in Path(raw_target).parts:
-        if part not in (".", "..", "latest", "latest-prerelease") and (product_dir / part).is_dir():
+    if valid_versions is None:
+        valid_versions = _product_dir_names(product_dir)
+    for part in raw_target.replace("\\", "/").split("/"):
+        if part in valid_versions and part not in _NAV_PARTS:
             return part
     return None
 
 
+def _latest_pointer_path(product_dir: Union[str, Path], latest_name: str) -> str:
+    # Pointer file next to the latest tree: <product>/<latest_name>.json
+    return os.path.join(product_dir, f"{latest_name}.json")
+
+
+def set_latest_pointer(product_dir: Path, version: str, latest_name: str = "latest") -> None:
+    # Atomically write {"version": ...} so readers resolve latest with one small read.
+    # os.open with 0o644 (not mkstemp, which forces 0600) so the umask decides who can read the pointer.
+    tmp = os.path.join(product_dir, f".{latest_name}.json.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": version}))
+        os.replace(tmp, _latest_pointer_path(product_dir, latest_name))
+    except BaseException:
+        unlink_if_exists(Path(tmp))
+        raise
+
+
+def _read_latest_pointer(product_dir: Path, latest_name: str) -> Optional[str]:
+    # Version from the pointer file, or None when missing, unreadable or pointing at a removed version
+    try:
+        with open(_latest_pointer_path(product_dir, latest_name), encoding="utf-8") as f:
+            v = json.loads(f.read()).get("version")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(v, str) or not v or v in _NAV_PARTS or not os.path.isdir(os.path.join(product_dir, v)):
+        return None
+    return v
+
+
+def clear_latest_tree(product_dir: Path, latest_name: str = "latest") -> None:
+    # Empty a latest tree (files only, dirs kept) and drop its pointer so it cannot outlive the tree
+    unlink_if_exists(Path(_latest_pointer_path(product_dir, latest_name)))
+    clear_dir_files_only(product_dir / latest_name)
+
+
+def _latest_tree_has_links(top: List[os.DirEntry]) -> bool:
+    # True once any symlink turns up in the root or one platform level; stops at the first hit
+    plat_dirs: List[str] = []
+    for e in top:
+        if e.is_symlink():
+            return True
+        if e.is_dir(follow_symlinks=False):
+            plat_dirs.append(e.path)
+    for d in plat_dirs:
+        try:
+            with os.scandir(d) as it:
+                if any(e.is_symlink() for e in it):
+                    return True
+        except OSError:
+            continue
+    return False
+
+
 def get_latest_version_from_symlinks(product_dir: Path, latest_name: str = "latest") -> Optional[str]:
-    # Read latest version from latest symlink tree
+    # Read latest version from the pointer file; fall back to the symlink tree (root files + one platform level)
+    # for products whose latest was set before pointers existed
     latest_root = product_dir / latest_name
-    if not latest_root.is_dir():
+    try:
+        with os.scandir(latest_root) as it:
+            top = list(it)
+    except OSError:
         return None
-    for p in latest_root.rglob("*"):
-        if p.is_symlink():
-            v = extract_version_from_symlink_target(product_dir, p)
+
+    # A pointer only counts while the tree it describes still has links (it may outlive a cleared tree)
+    v = _read_latest_pointer(product_dir, latest_name)
+    if v:
+        return v if _latest_tree_has_links(top) else None
+
+    valid_versions = _product_dir_names(product_dir)
+    plat_dirs: List[str] = []
+    for e in top:
+        if e.is_symlink():
+            v = extract_version_from_symlink_target(product_dir, e.path, valid_versions)
             if v:
                 return v
+        elif e.is_dir(follow_symlinks=False):
+            plat_dirs.append(e.path)
+
+    for d in plat_dirs:
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_symlink():
+                        v = extract_version_from_symlink_target(product_dir, e.path, valid_versions)
+                        if v:
+                            return v
+        except OSError:
+            continue
     return None
 
 
-def _rel_target(target: Path, link_dir: Path) -> Path:
+def _rel_target(target: Union[os.DirEntry, str, Path], link_dir: Union[str, Path]) -> str:
     # Create relative symlink targets
-    return Path(os.path.relpath(str(target), start=str(link_dir)))
+    return os.path.relpath(os.fspath(target), start=os.fspath(link_dir))
+
+
+# Scratch dirs that never got swapped in (crashed rebuild) are removed once they are this old
+_LATEST_TMP_MAX_AGE_S = 600.0
+
+
+def _sweep_latest_scratch(product_dir: Path, latest_name: str) -> None:
+    # Remove leftovers of earlier rebuilds: swapped-out *_stale trees whose background delete never
+    # finished (process exited), and abandoned tmp trees; recent tmp dirs may belong to a rebuild in flight
+    prefix = f".{latest_name}_tmp_"
+    cutoff = time.time() - _LATEST_TMP_MAX_AGE_S
+    try:
+        with os.scandir(product_dir) as it:
+            leftovers = [e for e in it if e.name.startswith(prefix) and e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    for e in leftovers:
+        try:
+            if e.name.endswith("_stale") or e.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(e.path, ignore_errors=True)
+        except OSError:
+            continue
 
 
 def set_latest_atomic(product_dir: Path, version: str, latest_name: str = "latest") -> None:
@@ -313,23 +554,38 @@ def set_latest_atomic(product_dir: Path, version: str, latest_name: str = "lates
     if not ver_dir.is_dir():
         raise FileNotFoundError(version)
 
-    ts = str(int(time.time() * 1000))
     latest_root = product_dir / latest_name
-    tmp = product_dir / f".{latest_name}_tmp_{ts}"
-    tmp.mkdir(parents=True, exist_ok=True)
+    _sweep_latest_scratch(product_dir, latest_name)
 
-    for f in list_files_assets(ver_dir):
-        (tmp / f.name).symlink_to(_rel_target(f, tmp))
+    # Unique scratch name: concurrent or same-millisecond rebuilds must never share a tmp/stale dir.
+    # Plain mkdir (not mkdtemp, which forces 0700) so the published tree gets the usual umask-derived mode.
+    tmp = os.path.join(product_dir, f".{latest_name}_tmp_{uuid.uuid4().hex}")
+    os.mkdir(tmp)
 
-    for plat_dir in list_dirs(ver_dir):
-        tp = tmp / plat_dir.name
-        tp.mkdir(parents=True, exist_ok=True)
-        for f in list_files_assets(plat_dir):
-            (tp / f.name).symlink_to(_rel_target(f, tp))
+    # Plan every (target, link) pair first; tmp is fresh, so platform dirs need a plain mkdir each
+    links: List[Tuple[str, str]] = [
+        (_rel_target(f, tmp), os.path.join(tmp, f.name)) for f in list_files_assets(ver_dir)
+    ]
+    for plat_dir in sorted(list_dirs_scandir(ver_dir), key=lambda e: e.name):
+        tp = os.path.join(tmp, plat_dir.name)
+        os.mkdir(tp)
+        links.extend((_rel_target(f, tp), os.path.join(tp, f.name)) for f in list_files_assets(plat_dir.path))
 
-    if latest_root.exists():
-        shutil.rmtree(latest_root)
-    tmp.rename(latest_root)
+    for target, link in links:
+        os.symlink(target, link)
+
+    # Swap the old tree aside with a rename, move the new one in, and delete the old tree off-thread;
+    # the rename pair keeps the no-latest window tiny and callers never wait on rmtree.
+    stale: Optional[str] = None
+    if os.path.lexists(latest_root):
+        stale = f"{tmp}_stale"
+        os.replace(latest_root, stale)
+    os.replace(tmp, latest_root)
+    set_latest_pointer(product_dir, version, latest_name=latest_name)
+    _invalidate_dircache(product_dir)
+
+    if stale is not None:
+        threading.Thread(target=shutil.rmtree, args=(stale,), kwargs={"ignore_errors": True}, daemon=True).start()
 
 
 def ensure_latest_exists(product_dir: Path, category: str) -> Optional[str]:
@@ -366,125 +622,148 @@ def strict_pick_latest_symlink(product_dir: Path, platform: str, latest_name: st
     return sorted(syms, key=lambda x: x.name)[0] if syms else None
 
 
-def build_projects_only() -> List[Dict[str, Any]]:
-    # Build portal projects list
-    result: List[Dict[str, Any]] = []
+def _project_releases_count(cache: _DirCache, category: str, product_dir: Path) -> int:
+    # Per-product work for build_projects_only; runs on a worker thread sharing the caller's dircache
+    with dircache(cache):
+        versions = list_versions(product_dir, category)
+        if category != "extensions":
+            ensure_latest_exists(product_dir, category)
+        return len(versions)
+
 
-    for cat in list_categories():
-        projects: List[Dict[str, Any]] = []
-
-        if cat == "extensions":
-            cat_dir = RELEASES_ROOT / cat
-            for ns_dir in list_dirs(cat_dir):
-                ns = ns_dir.name
-                if ns.lower() == "latest":
-                    continue
-                for ext_dir in list_dirs(ns_dir):
-                    ext = ext_dir.name
-                    if ext.lower() == "latest":
+def build_projects_only() -> List[Dict[str, Any]]:
+    # Build portal projects list; independent per-product filesystem work overlaps on a thread pool
+    with dircache() as cache:
+        categories = list_categories()
+        root = os.fspath(RELEASES_ROOT)
+
+        # (category, id, name, product_dir) in discovery order
+        entries: List[Tuple[str, str, str, Path]] = []
+        for cat in categories:
+            if cat == "extensions":
+                cat_dir = os.path.join(root, cat)
+                for ns_dir in list_dirs_scandir(cat_dir):
+                    ns = ns_dir.name
+                    if ns.lower() == "latest":
                         continue
-                    versions = list_versions(ext_dir, cat)
-                    projects.append(
-                        {
-                            "id": f"{ns}/{ext}",
-                            "name": f"{ns}.{ext}",
-                            "description": None,
-                            "releases_count": len(versions),
-                        }
-                    )
-            projects.sort(key=lambda x: (str(x.get("name") or ""), str(x.get("id") or "")))
-        else:
-            for proj in list_projects_for_category(cat):
-                pd = RELEASES_ROOT / cat / proj
-                versions = list_versions(pd, cat)
-                ensure_latest_exists(pd, cat)
-                projects.append(
-                    {
-                        "id": proj,
-                        "name": proj,
-                        "description": None,
-                        "releases_count": len(versions),
-                    }
-                )
-            projects.sort(key=lambda x: (str(x.get("name") or ""), str(x.get("id") or "")))
+                    for ext_dir in list_dirs_scandir(ns_dir.path):
+                        ext = ext_dir.name
+                        if ext.lower() == "latest":
+                            continue
+                        entries.append((cat, f"{ns}/{ext}", f"{ns}.{ext}", Path(ext_dir.path)))
+            else:
+                for proj in list_projects_for_category(cat):
+                    entries.append((cat, proj, proj, Path(os.path.join(root, cat, proj))))
+
+        counts: List[int] = []
+        if entries:
+            workers = min(32, (os.cpu_count() or 1) * 4, len(entries))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                counts = list(ex.map(lambda e: _project_releases_count(cache, e[0], e[3]), entries))
 
+    result: List[Dict[str, Any]] = []
+    for cat in categories:
+        projects: List[Dict[str, Any]] = [
+            {
+                "id": pid,
+                "name": name,
+                "description": None,
+                "releases_count": n,
+            }
+            for (c, pid, name, _), n in zip(entries, counts)
+            if c == cat
+        ]
+        projects.sort(key=lambda x: (str(x.get("name") or ""), str(x.get("id") or "")))
         result.append({"id": cat, "name": cat.capitalize(), "projects": projects})
 
     return result
 
 
-def build_releases_for_project(category: str, project: str) -> List[Dict[str, Any]]:
-    # Build portal releases list for a project
+def _release_for_version(pd_str: str, ver: str, root_prefix: str, latest_ver: Optional[str]) -> Dict[str, Any]:
+    # Portal release dict for one version dir
+    vdir = os.path.join(pd_str, ver)
+    assets: List[Dict[str, Any]] = []
+
+    root_files, plat_dirs = scan_version(vdir)
+
+    for f in root_files:
+        assets.append(
+            {
+                "name": f.name,
+                "size": human_size(f.stat().st_size),
+                "href": f"{root_prefix}/{f.name}",
+                "platform": None,
+            }
+        )
+
+    for plat_dir in plat_dirs:
+        plat_prefix = f"{root_prefix}/{plat_dir.name}"
+        for f in list_files_assets(plat_dir.path):
+            assets.append(
+                {
+                    "name": f.name,
+                    "size": human_size(f.stat().st_size),
+                    "href": f"{plat_prefix}/{f.name}",
+                    "platform": plat_dir.name,
+                }
+            )
+
+    notes = read_release_notes(vdir)
+    return {
+        "tag": ver,
+        "title": None,
+        "published_at": _published_epoch_from_dir(vdir),
+        "is_latest": bool(latest_ver) and ver == latest_ver,
+        "assets": assets,
+        "notes_name": notes[0] if notes else None,
+        "notes": notes[1] if notes else None,
+        "notes_html": notes[2] if notes else None,
+        "notes_format": notes[3] if notes else None,
+    }
+
+
+def iter_releases_for_project(
+    category: str, project: str, cache: Optional[_DirCache] = None
+) -> Iterator[Dict[str, Any]]:
+    # Yield portal release dicts for a project lazily, newest first.
+    # The dircache is installed only around each step, never across a yield, so an abandoned
+    # generator cannot leave a stale cache active on this thread.
     vendor: Optional[str] = None
     ext: Optional[str] = None
 
     if category == "extensions":
         parts = [p for p in (project or "").split("/") if p]
         if len(parts) != 2:
-            return []
+            return
         vendor, ext = parts[0], parts[1]
         if vendor.lower() == "latest" or ext.lower() == "latest":
-            return []
+            return
         pd = RELEASES_ROOT / category / vendor / ext
     else:
         pd = RELEASES_ROOT / category / project
 
     if not pd.is_dir():
-        return []
-
-    versions = list_versions(pd, category)
-    latest_ver = ensure_latest_exists(pd, category)
+        return
+    pd_str = os.fspath(pd)
+    if cache is None:
+        cache = _DirCache()
 
-    releases: List[Dict[str, Any]] = []
+    with dircache(cache):
+        versions = list_versions(pd, category)
+        latest_ver = ensure_latest_exists(pd, category)
 
     for ver in versions:
-        vdir = pd / ver
-        assets: List[Dict[str, Any]] = []
-
-        def rel_path_for(file_path: Path, platform: Optional[str] = None) -> str:
-            # Build storage-relative path for an asset
-            if category == "extensions" and vendor and ext:
-                if platform:
-                    return f"{category}/{vendor}/{ext}/{ver}/{platform}/{file_path.name}"
-                return f"{category}/{vendor}/{ext}/{ver}/{file_path.name}"
-            if platform:
-                return f"{category}/{project}/{ver}/{platform}/{file_path.name}"
-            return f"{category}/{project}/{ver}/{file_path.name}"
-
-        for f in list_files_assets(vdir):
-            assets.append(
-                {
-                    "name": f.name,
-                    "size": human_size(f.stat().st_size),
-                    "href": rel_path_for(f),
-                    "platform": None,
-                }
-            )
+        # Storage-relative href prefix, invariant for every asset of this version
+        if category == "extensions":
+            root_prefix = f"{category}/{vendor}/{ext}/{ver}"
+        else:
+            root_prefix = f"{category}/{project}/{ver}"
+
+        with dircache(cache):
+            release = _release_for_version(pd_str, ver, root_prefix, latest_ver)
+        yield release
 
-        for plat_dir in list_dirs(vdir):
-            for f in list_files_assets(plat_dir):
-                assets.append(
-                    {
-                        "name": f.name,
-                        "size": human_size(f.stat().st_size),
-                        "href": rel_path_for(f, platform=plat_dir.name),
-                        "platform": plat_dir.name,
-                    }
-                )
-
-        notes = read_release_notes(vdir)
-        releases.append(
-            {
-                "tag": ver,
-                "title": None,
-                "published_at": _published_epoch_from_dir(vdir),
-                "is_latest": bool(latest_ver) and ver == latest_ver,
-                "assets": assets,
-                "notes_name": notes[0] if notes else None,
-                "notes": notes[1] if notes else None,
-                "notes_html": notes[2] if notes else None,
-                "notes_format": notes[3] if notes else None,
-            }
-        )
 
-    return releases
+def build_releases_for_project(category: str, project: str) -> List[Dict[str, Any]]:
+    # Build portal releases list for a project; one dircache serves the whole build
+    return list(iter_releases_for_project(category, project, _DirCache()))
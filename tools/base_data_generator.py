@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 import time
 from dataclasses import dataclass
@@ -63,15 +64,30 @@ def write_dummy_file(path: Path, size_bytes: int) -> None:
     """
     Creates a file of a given size so human_size() in the app
     shows different size values.
+    Content is irrelevant, so the file is sized with truncate()
+    (sparse where the filesystem supports it) instead of written out.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
-    block = b"0" * 1024
-    remaining = size_bytes
     with path.open("wb") as f:
-        while remaining > 0:
-            chunk = block if remaining >= len(block) else block[:remaining]
-            f.write(chunk)
-            remaining -= len(chunk)
+        f.truncate(size_bytes)
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def write_small_file(path: Path, text: str) -> None:
+    """
+    Writes a tiny metadata file (RELEASED_AT, .sha256 sidecar, notes)
+    with a raw os.open/os.write/os.close, skipping the buffered text IO
+    wrapper that Path.write_text() builds for every file.
+    """
+    data = text.encode("utf-8")
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 def write_demo_notes(vdir: Path, project_id: str, version: str, version_index: int) -> None:
@@ -95,7 +111,7 @@ def write_demo_notes(vdir: Path, project_id: str, version: str, version_index: i
         f"- Feature #{version_index + 1}: demo change description.",
         "- Various internal improvements and bug fixes.",
     ]
-    notes_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    write_small_file(notes_path, "\n".join(lines) + "\n")
 
 
 def create_release(
@@ -115,7 +131,7 @@ def create_release(
 
     # RELEASED_AT: make older timestamps per version so ordering looks realistic
     released_at = int(time.time()) - version_index * 86400
-    (vdir / "RELEASED_AT").write_text(str(released_at), encoding="utf-8")
+    write_small_file(vdir / "RELEASED_AT", str(released_at))
 
     # Universal artifacts (version root)
     if "universal" in platforms:
@@ -124,7 +140,7 @@ def create_release(
         write_dummy_file(universal_path, size_bytes=2 * 1024 * 1024)  # ~2 MB
 
         sha_path = vdir / (universal_name + ".sha256")
-        sha_path.write_text("dummy-checksum-universal\n", encoding="utf-8")
+        write_small_file(sha_path, "dummy-checksum-universal\n")
 
     # Platform-specific artifacts
     for platform in platforms:
@@ -147,7 +163,7 @@ def create_release(
         write_dummy_file(artifact_path, size_bytes=size_bytes)
 
         sidecar = plat_dir / (artifact_name + ".sha256")
-        sidecar.write_text("dummy-checksum-platform\n", encoding="utf-8")
+        write_small_file(sidecar, "dummy-checksum-platform\n")
 
     write_demo_notes(vdir=vdir, project_id=project_id, version=version, version_index=version_index)
 
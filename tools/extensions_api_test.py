@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import argparse
-import io
+import contextlib
 import json
+import os
 import re
 import sys
 import hashlib
+import threading
+import uuid
 import zipfile
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple, Union
 from urllib.parse import urlparse
+from urllib.request import getproxies, proxy_bypass
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 
 DEFAULT_BASE_URL = "http://127.0.0.1:8000"
@@ -25,24 +38,37 @@ SEED_URLS = [
     "https://openvsx.eclipsecontent.org/KylinIdeTeam/cppdebug/darwin-x64/0.0.7/KylinIdeTeam.cppdebug-0.0.7@darwin-x64.vsix",
 ]
 
-ALLOWED_TP = {
-    "win32-x64",
-    "win32-ia32",
-    "win32-arm64",
-    "linux-x64",
-    "linux-arm64",
-    "linux-armhf",
-    "alpine-x64",
-    "alpine-arm64",
-    "darwin-x64",
-    "darwin-arm64",
-    "web",
-    "universal",
-}
-
-
-@dataclass(frozen=True)
-class VsixMeta:
+# Interned so membership hits and later equality checks against these names compare by identity first
+ALLOWED_TP = frozenset(
+    sys.intern(tp)
+    for tp in (
+        "win32-x64",
+        "win32-ia32",
+        "win32-arm64",
+        "linux-x64",
+        "linux-arm64",
+        "linux-armhf",
+        "alpine-x64",
+        "alpine-arm64",
+        "darwin-x64",
+        "darwin-arm64",
+        "web",
+        "universal",
+    )
+)
+# Maps an equal string to the stored instance, so normalize_tp returns the interned object without sys.intern
+_TP_CANON = {tp: tp for tp in ALLOWED_TP}
+
+
+_RE_IDENTITY_TP = re.compile(r"<\s*Identity\b[^>]*\bTargetPlatform\s*=\s*\"([^\"]+)\"", re.IGNORECASE)
+_RE_PROP_TP = re.compile(r'Id\s*=\s*"[^"]*TargetPlatform[^"]*"\s+Value\s*=\s*"([^"]+)"', re.IGNORECASE)
+_RE_AT_TP = re.compile(r"@([A-Za-z0-9._-]+)\.vsix$", re.IGNORECASE)
+_SEG_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-")
+# "/<tp>/" for any allowed platform; longest names first so a shorter prefix never shadows a longer one
+_TP_PATH_RE = re.compile(r"/(" + "|".join(sorted(map(re.escape, ALLOWED_TP), key=len, reverse=True)) + r")/")
+
+
+class VsixMeta(NamedTuple):
     publisher: str
     name: str
     version: str
@@ -52,38 +78,57 @@ class VsixMeta:
     source_url: str
 
 
-@dataclass
-class Check:
+class Check(NamedTuple):
     name: str
     ok: bool
     status: int
     detail: str
 
 
+def json_loads(raw: bytes) -> Any:
+    # orjson parses bytes directly; stdlib path decodes strictly as UTF-8 first
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8", errors="strict"))
+
+
+def json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
 def eprint(*a: Any) -> None:
     print(*a, file=sys.stderr)
 
 
-def sha256_bytes(b: bytes) -> str:
+def sha256_stream(f: BinaryIO) -> str:
+    # hashlib.file_digest (3.11+) runs the read/update loop in C; older Pythons chunk in Python
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, "sha256").hexdigest()
     h = hashlib.sha256()
-    h.update(b)
+    for chunk in iter(lambda: f.read(1 << 20), b""):
+        h.update(chunk)
     return h.hexdigest()
 
 
+@lru_cache(maxsize=256)
 def safe_segment(s: str) -> str:
     s = (s or "").strip()
     if not s or s in (".", ".."):
         raise ValueError("empty segment")
-    if not re.fullmatch(r"[A-Za-z0-9._-]+", s):
+    # Plain character-set check; no Pattern/Match objects on the hot path
+    if not _SEG_CHARS.issuperset(s):
         raise ValueError(f"bad segment: {s}")
     return s
 
 
+@lru_cache(maxsize=64)
 def normalize_tp(tp: str) -> str:
     v = (tp or "").strip().lower()
     if not v:
         return "universal"
-    return v if v in ALLOWED_TP else "universal"
+    return _TP_CANON.get(v, "universal")
 
 
 def req(
@@ -121,18 +166,18 @@ def req(
     return r
 
 
-def read_json_from_zip(zf: zipfile.ZipFile, path: str) -> Optional[Dict[str, Any]]:
+def read_json_from_zip(zf: zipfile.ZipFile, path: Union[str, zipfile.ZipInfo]) -> Optional[Dict[str, Any]]:
     try:
         raw = zf.read(path)
     except KeyError:
         return None
     try:
-        return json.loads(raw.decode("utf-8", errors="strict"))
+        return json_loads(raw)
     except Exception:
         return None
 
 
-def read_text_from_zip(zf: zipfile.ZipFile, path: str) -> Optional[str]:
+def read_text_from_zip(zf: zipfile.ZipFile, path: Union[str, zipfile.ZipInfo]) -> Optional[str]:
     try:
         raw = zf.read(path)
     except KeyError:
@@ -144,117 +189,182 @@ def read_text_from_zip(zf: zipfile.ZipFile, path: str) -> Optional[str]:
 
 
 def parse_target_platform_from_manifest(manifest_text: str) -> Optional[str]:
-    m_identity = re.search(
-        r"<\s*Identity\b[^>]*\bTargetPlatform\s*=\s*\"([^\"]+)\"",
-        manifest_text,
-        flags=re.IGNORECASE,
-    )
+    m_identity = _RE_IDENTITY_TP.search(manifest_text)
     if m_identity:
         tp = (m_identity.group(1) or "").strip().lower()
         return tp or None
 
-    m_prop = re.search(
-        r'Id\s*=\s*"[^"]*TargetPlatform[^"]*"\s+Value\s*=\s*"([^"]+)"',
-        manifest_text,
-        flags=re.IGNORECASE,
-    )
+    m_prop = _RE_PROP_TP.search(manifest_text)
     if not m_prop:
         return None
     tp = (m_prop.group(1) or "").strip().lower()
     return tp or None
 
 
-def infer_target_platform_from_filename_or_url(source_url: str, filename: str) -> Optional[str]:
-    m = re.search(r"@([A-Za-z0-9._-]+)\.vsix$", filename, flags=re.IGNORECASE)
+def url_basename(url_path: str) -> str:
+    # Last non-empty segment of a URL path (what Path(url_path).name gave, without building a Path)
+    return url_path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def infer_target_platform_from_filename_or_url(
+    source_url: str, filename: str, url_path: Optional[str] = None
+) -> Optional[str]:
+    m = _RE_AT_TP.search(filename)
     if m:
         return m.group(1).lower()
 
-    path = urlparse(source_url).path.lower()
-    for tp in ALLOWED_TP:
-        if f"/{tp}/" in path:
-            return tp
-    return None
+    if url_path is None:
+        url_path = urlparse(source_url).path
+    m = _TP_PATH_RE.search(url_path.lower())
+    return m.group(1) if m else None
 
 
-def extract_vsix_meta(vsix_bytes: bytes, source_url: str) -> VsixMeta:
-    if len(vsix_bytes) < 4 or vsix_bytes[:2] != b"PK":
+def _check_pk_header(head: bytes) -> None:
+    if len(head) < 4 or head[:2] != b"PK":
         raise ValueError("not a zip/vsix (missing PK header)")
 
-    with zipfile.ZipFile(io.BytesIO(vsix_bytes)) as zf:
-        pkg = None
-        for cand in ("extension/package.json", "package.json"):
-            pkg = read_json_from_zip(zf, cand)
-            if pkg is not None:
-                break
-        if not pkg:
-            raise ValueError("VSIX missing package.json")
-
-        publisher = safe_segment(str(pkg.get("publisher", "")).strip())
-        name = safe_segment(str(pkg.get("name", "")).strip())
-        version = str(pkg.get("version", "")).strip()
-        if not version:
-            raise ValueError("VSIX missing version field in package.json")
-
-        tp: Optional[str] = None
-
-        manifest_text = None
-        for cand in ("extension.vsixmanifest", "extension/extension.vsixmanifest"):
-            manifest_text = read_text_from_zip(zf, cand)
-            if manifest_text:
-                break
 
+def extract_vsix_meta_from_zipfile(zf: zipfile.ZipFile, source_url: str, sha256_hex: str) -> VsixMeta:
+    # Central directory is parsed once by ZipFile; probe it by name and only read members that exist
+    entries = zf.NameToInfo
+
+    pkg = None
+    for cand in ("extension/package.json", "package.json"):
+        info = entries.get(cand)
+        if info is None:
+            continue
+        pkg = read_json_from_zip(zf, info)
+        if pkg is not None:
+            break
+    if not pkg:
+        raise ValueError("VSIX missing package.json")
+
+    publisher = safe_segment(str(pkg.get("publisher", "")).strip())
+    name = safe_segment(str(pkg.get("name", "")).strip())
+    version = str(pkg.get("version", "")).strip()
+    if not version:
+        raise ValueError("VSIX missing version field in package.json")
+
+    tp: Optional[str] = None
+
+    manifest_text = None
+    for cand in ("extension.vsixmanifest", "extension/extension.vsixmanifest"):
+        info = entries.get(cand)
+        if info is None:
+            continue
+        manifest_text = read_text_from_zip(zf, info)
         if manifest_text:
-            tp = parse_target_platform_from_manifest(manifest_text)
+            break
 
-        filename_guess = f"{publisher}.{name}-{version}.vsix"
-        tp2 = infer_target_platform_from_filename_or_url(
-            source_url,
-            Path(urlparse(source_url).path).name or filename_guess,
-        )
+    if manifest_text:
+        tp = parse_target_platform_from_manifest(manifest_text)
+
+    url_path = urlparse(source_url).path
+    url_name = url_basename(url_path)
+    filename_guess = f"{publisher}.{name}-{version}.vsix"
+    tp2 = infer_target_platform_from_filename_or_url(source_url, url_name or filename_guess, url_path)
+
+    if tp and tp not in ALLOWED_TP:
+        tp = None
+    if tp is None and tp2 and tp2 in ALLOWED_TP:
+        tp = tp2
+    if tp is None:
+        tp = "universal"
+
+    filename = url_name if url_name else filename_guess
+
+    return VsixMeta(
+        publisher=publisher,
+        name=name,
+        version=version,
+        target_platform=tp,
+        sha256=sha256_hex,
+        filename=filename,
+        source_url=source_url,
+    )
 
-        if tp and tp not in ALLOWED_TP:
-            tp = None
-        if tp is None and tp2 and tp2 in ALLOWED_TP:
-            tp = tp2
-        if tp is None:
-            tp = "universal"
-
-        url_name = Path(urlparse(source_url).path).name
-        filename = url_name if url_name else filename_guess
-
-        return VsixMeta(
-            publisher=publisher,
-            name=name,
-            version=version,
-            target_platform=tp,
-            sha256=sha256_bytes(vsix_bytes),
-            filename=filename,
-            source_url=source_url,
-        )
 
+def extract_vsix_meta_from_file(f: BinaryIO, source_url: str, sha256_hex: Optional[str] = None) -> VsixMeta:
+    # VSIX on disk: hash the file without a Python-level copy (unless the digest is known) and let ZipFile
+    # read only the central directory + needed members
+    _check_pk_header(f.read(4))
+    f.seek(0)
+    if sha256_hex is None:
+        sha256_hex = sha256_stream(f)
+        f.seek(0)
+    with zipfile.ZipFile(f) as zf:
+        return extract_vsix_meta_from_zipfile(zf, source_url, sha256_hex)
 
-def download_vsix(sess: requests.Session, url: str, workdir: Path, force: bool) -> Tuple[Path, VsixMeta, bytes]:
+
+# Bounded connect, and a per-read stall limit rather than a total cap so large VSIX files still finish
+_DOWNLOAD_TIMEOUT = urllib3.Timeout(connect=10.0, read=60.0)
+
+
+def download_stream(
+    pool: urllib3.PoolManager,
+    url: str,
+    out: Optional[BinaryIO] = None,
+    expected: Tuple[int, ...] = (200,),
+) -> Tuple[str, int]:
+    # GET straight through urllib3, hashing (and optionally writing) each chunk; returns (sha256, bytes read)
+    r = pool.request("GET", url, preload_content=False, timeout=_DOWNLOAD_TIMEOUT)
+    try:
+        if r.status not in expected:
+            try:
+                body = r.read(1200).decode("utf-8", errors="replace")
+            except Exception:
+                body = "<non-text>"
+            raise RuntimeError(f"GET {url} -> {r.status}, expected {expected}. Body: {body}")
+        h = hashlib.sha256()
+        n = 0
+        for chunk in r.stream(1 << 20):
+            h.update(chunk)
+            n += len(chunk)
+            if out is not None:
+                out.write(chunk)
+        return h.hexdigest(), n
+    finally:
+        r.release_conn()
+
+
+def download_vsix(pool: urllib3.PoolManager, url: str, workdir: Path, force: bool) -> Tuple[Path, VsixMeta]:
+    # The VSIX stays on disk; callers get its path rather than the bytes
     workdir.mkdir(parents=True, exist_ok=True)
-    fn = Path(urlparse(url).path).name or "download.vsix"
+    fn = url_basename(urlparse(url).path) or "download.vsix"
     target = workdir / fn
 
-    if target.exists() and not force:
-        b = target.read_bytes()
-        meta = extract_vsix_meta(b, url)
-        return target, meta, b
+    if not force:
+        # Open directly instead of exists() + read: one syscall on a miss, and no gap for a concurrent writer
+        try:
+            f = open(target, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            with f:
+                return target, extract_vsix_meta_from_file(f, url)
+
+    # Hash and write each chunk in one pass; the .part rename keeps a failed download out of the cache,
+    # and a per-call name keeps workers fetching the same file from writing into each other's part.
+    # os.open with 0o644 (not mkstemp, which forces 0600) so the cached VSIX gets the umask-derived mode.
+    part = target.with_name(f"{target.name}.{uuid.uuid4().hex}.part")
+    fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            sha256_hex, _ = download_stream(pool, url, fh)
+        part.replace(target)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
 
-    r = req(sess, "GET", url, expected=(200,), stream=True)
-    b = r.content
-    target.write_bytes(b)
-    meta = extract_vsix_meta(b, url)
-    return target, meta, b
+    with open(target, "rb") as f:
+        return target, extract_vsix_meta_from_file(f, url, sha256_hex)
 
 
 def publish_openvsx_like(
     sess: requests.Session,
     base_url: str,
     publish_path: str,
-    vsix_bytes: bytes,
+    vsix: Union[bytes, Path],
     *,
     tp: str,
     filename: str,
@@ -262,56 +372,69 @@ def publish_openvsx_like(
     url = base_url.rstrip("/") + publish_path
     tp_n = normalize_tp(tp)
 
-    # OpenVSX publish: multipart/form-data, "file" + form "targetPlatform"
-    files = {"file": (filename or "extension.vsix", vsix_bytes, "application/octet-stream")}
     data = {}
     if tp_n and tp_n != "universal":
         data["targetPlatform"] = tp_n
 
-    r = req(sess, "POST", url, expected=(200, 201), files=files, data=data, headers={"Accept": "application/json"})
-    j = r.json()
+    # OpenVSX publish: multipart/form-data, "file" + form "targetPlatform". A path is opened here, but requests
+    # still reads the whole file to build the multipart body, so the upload is buffered in memory either way
+    with contextlib.ExitStack() as stack:
+        payload = vsix if isinstance(vsix, bytes) else stack.enter_context(open(vsix, "rb"))
+        files = {"file": (filename or "extension.vsix", payload, "application/octet-stream")}
+        r = req(sess, "POST", url, expected=(200, 201), files=files, data=data, headers={"Accept": "application/json"})
+    j = json_loads(r.content)
     return j if isinstance(j, dict) else {"raw": j}
 
 
-def download_bytes(sess: requests.Session, url: str, expected: Tuple[int, ...] = (200,)) -> bytes:
-    r = req(sess, "GET", url, expected=expected, stream=True)
-    return r.content
-
-
-def post_json(sess: requests.Session, url: str, body: Dict[str, Any], expected: Tuple[int, ...] = (200,)) -> Dict[str, Any]:
+def stream_verify(sess: requests.Session, url: str, expected_sha256: str) -> Tuple[bool, str]:
+    # Hash the body chunk by chunk without keeping it; returns (digest matches, digest)
+    h = hashlib.sha256()
+    head = b""
+    with req(sess, "GET", url, expected=(200,), stream=True) as r:
+        for chunk in r.iter_content(chunk_size=1 << 20):
+            if len(head) < 4:
+                head += chunk[: 4 - len(head)]
+                if len(head) >= 2 and head[:2] != b"PK":
+                    # Not a zip: stop before pulling the rest of the body
+                    raise RuntimeError("downloaded bytes are not a VSIX/zip")
+            h.update(chunk)
+    if len(head) < 4:
+        raise RuntimeError("downloaded bytes are not a VSIX/zip")
+    got = h.hexdigest()
+    return got == expected_sha256, got
+
+
+def post_json(
+    sess: requests.Session, url: str, body: Union[Dict[str, Any], bytes], expected: Tuple[int, ...] = (200,)
+) -> Dict[str, Any]:
+    # body may already be encoded JSON bytes
     r = req(
         sess,
         "POST",
         url,
         expected=expected,
         headers={"Content-Type": "application/json", "Accept": "application/json;api-version=3.0-preview.1"},
-        json_body=body,
+        data=body if isinstance(body, bytes) else json_dumps(body),
     )
-    return r.json()
+    return json_loads(r.content)
 
 
 def get_json(sess: requests.Session, url: str, expected: Tuple[int, ...] = (200,)) -> Dict[str, Any]:
     r = req(sess, "GET", url, expected=expected)
-    return r.json()
+    return json_loads(r.content)
+
+
+# Static extensionquery JSON; only the two criteria values vary. filterType 8 = targetPlatform, 4 = extensionId;
+# flags 403 = 0x1 | 0x2 | 0x80 | 0x10 | 0x100
+_QUERY_TEMPLATE = (
+    b'{"filters":[{"criteria":[{"filterType":8,"value":%b},{"filterType":4,"value":%b}],'
+    b'"pageNumber":1,"pageSize":20,"sortBy":0,"sortOrder":0}],"flags":403}'
+)
 
 
-def vscode_extensionquery_body(ext_id: str, tp: str) -> Dict[str, Any]:
+def vscode_extensionquery_body(ext_id: str, tp: str) -> bytes:
     # Ваша реализация FILTER_TARGET (8) ожидает именно targetPlatform (win32-x64 и т.п.)
-    return {
-        "filters": [
-            {
-                "criteria": [
-                    {"filterType": 8, "value": tp},      # targetPlatform
-                    {"filterType": 4, "value": ext_id},  # extensionId
-                ],
-                "pageNumber": 1,
-                "pageSize": 20,
-                "sortBy": 0,
-                "sortOrder": 0,
-            }
-        ],
-        "flags": 0x1 | 0x2 | 0x80 | 0x10 | 0x100,
-    }
+    return _QUERY_TEMPLATE % (json_dumps(tp), json_dumps(ext_id))
 
 
 def pick_vsix_source_from_extensionquery(
@@ -329,20 +452,19 @@ def pick_vsix_source_from_extensionquery(
         raise RuntimeError("extensionquery: missing extensions list")
 
     want = (ext_id or "").strip().lower()
-    target = None
-    for x in exts:
-        if not isinstance(x, dict):
-            continue
-        got = str(x.get("extensionId") or "").strip().lower()
-        if got == want:
-            target = x
-            break
+    # Exact match short-circuits; only differently-cased/padded ids pay for normalization
+    target = next(
+        (
+            x
+            for x in exts
+            if isinstance(x, dict)
+            and (x.get("extensionId") == ext_id or str(x.get("extensionId") or "").strip().lower() == want)
+        ),
+        None,
+    )
 
-    if not target:
-        got_ids = []
-        for x in exts:
-            if isinstance(x, dict) and x.get("extensionId"):
-                got_ids.append(str(x.get("extensionId")))
+    if target is None:
+        got_ids = [str(x["extensionId"]) for x in exts if isinstance(x, dict) and x.get("extensionId")]
         raise RuntimeError(f"extensionquery: extensionId not found: {ext_id} (got: {got_ids})")
 
     versions = target.get("versions")
@@ -358,26 +480,24 @@ def pick_vsix_source_from_extensionquery(
                 return f["source"]
         return None
 
-    # 1) Prefer an exact version match if requested
-    if prefer_version:
-        pv = str(prefer_version).strip()
-        for v in versions:
-            if not isinstance(v, dict):
-                continue
-            ver = str(v.get("version") or "").strip()
-            if ver == pv:
-                src = extract_first_source(v)
-                if src:
-                    return ver, src
-
-    # 2) Fallback: first available source (usually latest)
+    # version -> first source, in response order; one pass serves both the exact match and the fallback
+    ver_map: Dict[str, str] = {}
     for v in versions:
         if not isinstance(v, dict):
             continue
-        ver = str(v.get("version") or "").strip()
         src = extract_first_source(v)
         if src:
-            return ver, src
+            ver_map.setdefault(str(v.get("version") or "").strip(), src)
+
+    # 1) Prefer an exact version match if requested
+    if prefer_version:
+        pv = str(prefer_version).strip()
+        if pv in ver_map:
+            return pv, ver_map[pv]
+
+    # 2) Fallback: first available source (usually latest)
+    if ver_map:
+        return next(iter(ver_map.items()))
 
     raise RuntimeError("extensionquery: no versions[].files[].source found")
 
@@ -392,7 +512,12 @@ def print_report(title: str, checks: List[Check]) -> bool:
     return ok_all
 
 
-def check_marketplace_flow(sess: requests.Session, base_url: str, meta: VsixMeta) -> List[Check]:
+def check_marketplace_flow(
+    sess: requests.Session,
+    base_url: str,
+    meta: VsixMeta,
+    side: ThreadPoolExecutor,
+) -> List[Check]:
     checks: List[Check] = []
     vscode = base_url.rstrip("/") + "/vscode"
 
@@ -405,6 +530,34 @@ def check_marketplace_flow(sess: requests.Session, base_url: str, meta: VsixMeta
     tp = normalize_tp(meta.target_platform or "universal")
     ext_id = f"{meta.publisher}.{meta.name}"
 
+    # 4) LATEST (optional but should work in вашей реализации)
+    latest_url = f"{vscode}/gallery/{meta.publisher}/{meta.name}/latest?targetPlatform={tp}"
+
+    def check_latest() -> Check:
+        name = "GET /vscode/gallery/{ns}/{ext}/latest"
+        try:
+            j2 = get_json(worker_session(), latest_url, expected=(200,))
+            got_id = str(j2.get("extensionId") or "").strip().lower()
+            want_id = str(ext_id or "").strip().lower()
+            if got_id != want_id:
+                raise RuntimeError(f"extensionId mismatch: got={j2.get('extensionId')} expected={ext_id}")
+            return Check(name=name, ok=True, status=200, detail=latest_url)
+        except Exception as exc:
+            return Check(name=name, ok=False, status=0, detail=f"{latest_url} :: {exc}")
+
+    # 5) UNPKG root listing (optional; если unpacked есть — будет 200, если нет — может быть 200 (zip listing) тоже)
+    unpkg_root = f"{vscode}/unpkg/{meta.publisher}/{meta.name}/{meta.version}/?targetPlatform={tp}"
+
+    def check_unpkg() -> Check:
+        name = "GET /vscode/unpkg/.../"
+        try:
+            j3 = get_json(worker_session(), unpkg_root, expected=(200,))
+            if not isinstance(j3, list):
+                raise RuntimeError("expected list response")
+            return Check(name=name, ok=True, status=200, detail=unpkg_root)
+        except Exception as exc:
+            return Check(name=name, ok=False, status=0, detail=f"{unpkg_root} :: {exc}")
+
     # 1) SEARCH
     qurl = f"{vscode}/gallery/extensionquery"
     try:
@@ -425,42 +578,121 @@ def check_marketplace_flow(sess: requests.Session, base_url: str, meta: VsixMeta
         bad("extensionquery: pick files.source", 0, str(exc))
         return checks
 
+    # 4) and 5) are independent reads: once the search has succeeded they run on the shared side pool
+    # (each side thread keeps its own Session) while 3) downloads; results are still reported in step order
+    latest_fut = side.submit(check_latest)
+    unpkg_fut = side.submit(check_unpkg)
+
     # 3) DOWNLOAD VIA MARKETPLACE URL
     try:
-        b = download_bytes(sess, src, expected=(200,))
-        if len(b) < 4 or b[:2] != b"PK":
-            raise RuntimeError("downloaded bytes are not a VSIX/zip")
-        got = sha256_bytes(b)
-        if got != meta.sha256:
+        same, got = stream_verify(sess, src, meta.sha256)
+        if not same:
             raise RuntimeError(f"sha256 mismatch: got {got} expected {meta.sha256}")
         ok("Download VSIX via files.source + SHA256", 200, src)
     except Exception as exc:
         bad("Download VSIX via files.source + SHA256", 0, f"{src} :: {exc}")
 
-    # 4) LATEST (optional but should work in вашей реализации)
-    latest_url = f"{vscode}/gallery/{meta.publisher}/{meta.name}/latest?targetPlatform={tp}"
-    try:
-        j2 = get_json(sess, latest_url, expected=(200,))
-        got_id = str(j2.get("extensionId") or "").strip().lower()
-        want_id = str(ext_id or "").strip().lower()
-        if got_id != want_id:
-            raise RuntimeError(f"extensionId mismatch: got={j2.get('extensionId')} expected={ext_id}")
+    checks.append(latest_fut.result())
+    checks.append(unpkg_fut.result())
+    return checks
+
+
+_session_local = threading.local()
+
+
+def make_session() -> requests.Session:
+    # Keep-alive pool sized for repeated calls to the same hosts; idempotent requests retry on gateway errors
+    sess = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    sess.headers.update({"User-Agent": "vsix-migrator/1.0"})
+    return sess
+
+
+class _EnvProxyPoolManager(urllib3.PoolManager):
+    # A bare PoolManager ignores the environment; route through HTTP(S)_PROXY and honour NO_PROXY as requests does
+    def __init__(self, **kw: Any) -> None:
+        super().__init__(**kw)
+        proxies = getproxies()
+        self._proxied = {
+            scheme: urllib3.ProxyManager(proxies[scheme], **kw) for scheme in ("http", "https") if proxies.get(scheme)
+        }
+
+    def urlopen(self, method: str, url: str, redirect: bool = True, **kw: Any) -> Any:
+        u = urlparse(url)
+        pm = self._proxied.get(u.scheme)
+        if pm is not None and not proxy_bypass(u.hostname or ""):
+            return pm.urlopen(method, url, redirect=redirect, **kw)
+        return super().urlopen(method, url, redirect=redirect, **kw)
+
+
+def make_download_pool() -> urllib3.PoolManager:
+    # Bulk VSIX downloads skip the requests layer; PoolManager is thread-safe and shared by all workers
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+    return _EnvProxyPoolManager(num_pools=4, maxsize=16, retries=retry, headers={"Accept-Encoding": "gzip"})
+
+
+def worker_session() -> requests.Session:
+    # One Session per worker thread, reused across the URLs it processes so TLS connections stay warm
+    sess = getattr(_session_local, "sess", None)
+    if sess is None:
+        sess = _session_local.sess = make_session()
+    return sess
+
+
+def process_url(
+    url: str,
+    base_url: str,
+    publish_path: str,
+    workdir: Path,
+    force: bool,
+    pool: urllib3.PoolManager,
+    side: ThreadPoolExecutor,
+    print_lock: threading.Lock,
+) -> bool:
+    # Download + publish + marketplace checks for one URL; runs on a worker thread with that thread's Session
+    sess = worker_session()
 
-        ok("GET /vscode/gallery/{ns}/{ext}/latest", 200, latest_url)
+    try:
+        file_path, meta = download_vsix(pool, url, workdir, force)
     except Exception as exc:
-        bad("GET /vscode/gallery/{ns}/{ext}/latest", 0, f"{latest_url} :: {exc}")
+        with print_lock:
+            eprint(f"ERROR downloading/parsing {url}: {exc}")
+        return False
 
-    # 5) UNPKG root listing (optional; если unpacked есть — будет 200, если нет — может быть 200 (zip listing) тоже)
-    unpkg_root = f"{vscode}/unpkg/{meta.publisher}/{meta.name}/{meta.version}/?targetPlatform={tp}"
+    header = [
+        f"Downloaded: {url}",
+        f"Saved as:  {file_path}",
+        f"Parsed:    {meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform} sha256={meta.sha256[:12]}…",
+    ]
+
+    # publish (OpenVSX-style)
     try:
-        j3 = get_json(sess, unpkg_root, expected=(200,))
-        if not isinstance(j3, list):
-            raise RuntimeError("expected list response")
-        ok("GET /vscode/unpkg/.../", 200, unpkg_root)
+        publish_openvsx_like(
+            sess,
+            base_url,
+            publish_path,
+            file_path,
+            tp=meta.target_platform,
+            filename=meta.filename,
+        )
     except Exception as exc:
-        bad("GET /vscode/unpkg/.../", 0, f"{unpkg_root} :: {exc}")
+        with print_lock:
+            print("\n".join(header))
+            eprint(f"ERROR publishing {meta.filename}: {exc}")
+        return False
 
-    return checks
+    # marketplace client flow
+    checks = check_marketplace_flow(sess, base_url, meta, side)
+
+    # Print each URL's whole report in one block so parallel workers don't interleave
+    title = f"{meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform} sha256={meta.sha256[:12]}…"
+    with print_lock:
+        print("\n".join(header))
+        print(f"Published to {base_url}{publish_path}: {meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform}")
+        return print_report(title + " :: Marketplace flow", checks)
 
 
 def main() -> int:
@@ -475,42 +707,22 @@ def main() -> int:
     base_url = args.base_url.rstrip("/")
     publish_path = args.publish_path
     workdir = Path(args.workdir)
+    if not args.urls:
+        return 0
 
-    sess = requests.Session()
-
+    # Each URL is dominated by network latency, so run the pipelines side by side
+    pool = make_download_pool()
+    print_lock = threading.Lock()
     overall_ok = True
-    for url in args.urls:
-        try:
-            file_path, meta, vsix_bytes = download_vsix(sess, url, workdir, args.force)
-            print(f"Downloaded: {url}")
-            print(f"Saved as:  {file_path}")
-            print(f"Parsed:    {meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform} sha256={meta.sha256[:12]}…")
-        except Exception as exc:
-            eprint(f"ERROR downloading/parsing {url}: {exc}")
-            overall_ok = False
-            continue
-
-        # publish (OpenVSX-style)
-        try:
-            pub = publish_openvsx_like(
-                sess,
-                base_url,
-                publish_path,
-                vsix_bytes,
-                tp=meta.target_platform,
-                filename=meta.filename,
-            )
-            print(f"Published to {base_url}{publish_path}: {meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform}")
-        except Exception as exc:
-            eprint(f"ERROR publishing {meta.filename}: {exc}")
-            overall_ok = False
-            continue
-
-        # marketplace client flow
-        title = f"{meta.publisher}.{meta.name}@{meta.version} tp={meta.target_platform} sha256={meta.sha256[:12]}…"
-        checks = check_marketplace_flow(sess, base_url, meta)
-        ok_all = print_report(title + " :: Marketplace flow", checks)
-        overall_ok = overall_ok and ok_all
+    workers = min(16, len(args.urls))
+    # Side pool for each flow's independent checks; created once so its threads' Sessions stay warm across URLs
+    with ThreadPoolExecutor(max_workers=2 * workers) as side, ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(process_url, url, base_url, publish_path, workdir, args.force, pool, side, print_lock)
+            for url in args.urls
+        ]
+        for fut in as_completed(futures):
+            overall_ok = fut.result() and overall_ok
 
     return 0 if overall_ok else 1
 